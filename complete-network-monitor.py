@@ -5,31 +5,99 @@ Includes: Attendance Tracking, WiFi Distance Estimation, and Departure Detection
 Works on Windows, Linux, and macOS
 """
 
+import asyncio
 import subprocess
 import socket
+import selectors
+import select
+import signal
+import struct
 import time
 import json
 import re
 import threading
 import platform
+import gzip
+import hashlib
 import sys
 import os
+import csv
+import io
 import math
+import types
+import atexit
+import bisect
+import importlib.util
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
-# Flask imports
-try:
-    from flask import Flask, jsonify, render_template_string, request, send_file
-    from flask_cors import CORS
-    HAS_FLASK = True
-except ImportError:
-    HAS_FLASK = False
+# uname never changes while we're running - sample it once
+_PLATFORM = platform.system()
+_IS_LINUX = _PLATFORM == 'Linux'
+
+# Flask imports. The routes below are declared at module scope so Flask
+# itself can't be deferred, but probing the metadata first means a bare
+# interpreter exits instantly with the hint instead of unwinding a
+# half-finished import of flask and its transitive dependencies
+HAS_FLASK = (importlib.util.find_spec('flask') is not None
+             and importlib.util.find_spec('flask_cors') is not None)
+if not HAS_FLASK:
     print("Flask not installed. Install with: pip install flask flask-cors")
     sys.exit(1)
 
+from flask import Flask, Response, jsonify, render_template_string, request, stream_with_context
+from flask_cors import CORS
+
+# Optional NumPy for vectorized RSSI -> distance math
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Optional fast JSON encoder for the polled endpoints
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Optional uvloop - faster event loop for the concurrent sweeps
+try:
+    import uvloop
+    uvloop.install()
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
+# Optional ASGI stack - epoll-based I/O beats one-thread-per-request
+# when several dashboards poll the JSON endpoints at once
+try:
+    import uvicorn
+    from asgiref.wsgi import WsgiToAsgi
+    HAS_UVICORN = True
+except ImportError:
+    HAS_UVICORN = False
+
+# Optional production WSGI server - Werkzeug's dev server serializes
+# requests and stalls the UI whenever a sweep holds the interpreter
+try:
+    from waitress import serve as waitress_serve
+    HAS_WAITRESS = True
+except ImportError:
+    HAS_WAITRESS = False
+
+# Optional raw-socket pings (no fork/exec per host)
+try:
+    from icmplib import async_multiping, SocketPermissionError
+    HAS_ICMPLIB = True
+except ImportError:
+    HAS_ICMPLIB = False
+
 # Platform-specific imports for sound
-if platform.system() == 'Windows':
+if _PLATFORM == 'Windows':
     try:
         import winsound
         HAS_WINSOUND = True
@@ -38,6 +106,30 @@ if platform.system() == 'Windows':
 else:
     HAS_WINSOUND = False
 
+# Compiled once at import - these patterns run on every scan
+_WIN_AVG_RE = re.compile(r'Average = (\d+)ms')
+_NIX_AVG_RE = re.compile(r'avg/([\d.]+)/')
+# Bytes-mode: the ARP table is scanned straight off the subprocess
+# output without decoding it or splitting it into line strings.
+# Octets are {1,2} because macOS arp prints single digits (e.g. 0:1a:...)
+_ARP_LINE_RE = re.compile(
+    rb'\(?(\d+\.\d+\.\d+\.\d+)\)?.*?((?:[0-9a-fA-F]{1,2}[:-]){5}[0-9a-fA-F]{1,2})')
+
+# Echo-request layout for the raw-socket sweep: 8-byte ICMP header
+# (type, code, checksum, ident, seq) + 56-byte zero payload
+_ICMP_HDR = struct.Struct('!BBHHH')
+_ICMP_PKT_LEN = 8 + 56
+_ICMP_WORDS = struct.Struct('!%dH' % (_ICMP_PKT_LEN // 2))
+
+# Keep ping/arp spawns on CPython's posix_spawn fast path: argv lists
+# (never shell=True) plus close_fds=False lets subprocess skip the
+# fork+exec round trip on Linux
+_SPAWN_KW = {} if _PLATFORM == 'Windows' else {'close_fds': False}
+
+# Zone thresholds in metres, kept sorted so lookup is a single bisect
+_ZONE_BOUNDS = (10, 30, 50)
+_ZONE_NAMES = ('on-site', 'near-site', 'leaving', 'away')
+
 # Enhanced HTML with both attendance and distance features
 HTML_PAGE = '''
 <!DOCTYPE html>
@@ -146,9 +238,17 @@ HTML_PAGE = '''
             padding: 20px;
             border-radius: 10px;
             box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            max-height: 400px;
+        }
+        /* Virtualized list: a fixed viewport scrolls over a sizer div
+           and a small pool of absolutely-positioned recycled rows */
+        .alert-viewport {
+            position: relative;
+            height: 400px;
             overflow-y: auto;
         }
+        #alertSizer {
+            position: relative;
+        }
         .alert-entry {
             padding: 10px;
             margin: 5px 0;
@@ -156,6 +256,15 @@ HTML_PAGE = '''
             background: #f8f9fa;
             border-radius: 4px;
         }
+        .alert-viewport .alert-entry {
+            position: absolute;
+            top: 0;
+            left: 0;
+            right: 0;
+            margin: 0;
+            box-sizing: border-box;
+            overflow: hidden;
+        }
         .alert-entry.arrival {
             border-left-color: #28a745;
         }
@@ -166,6 +275,10 @@ HTML_PAGE = '''
             font-weight: bold;
             color: #666;
         }
+        .alert-meta {
+            font-size: 12px;
+            color: #999;
+        }
         .device-grid {
             display: grid;
             grid-template-columns: repeat(auto-fill, minmax(380px, 1fr));
@@ -444,10 +557,10 @@ HTML_PAGE = '''
         </div>
         
         <div class="tabs">
-            <div class="tab active" onclick="showTab('devices')">Devices</div>
-            <div class="tab" onclick="showTab('alerts')">Alerts</div>
-            <div class="tab" onclick="showTab('attendance')">Attendance</div>
-            <div class="tab" onclick="showTab('distance')">Distance</div>
+            <div class="tab active" onclick="showTab(event, 'devices')">Devices</div>
+            <div class="tab" onclick="showTab(event, 'alerts')">Alerts</div>
+            <div class="tab" onclick="showTab(event, 'attendance')">Attendance</div>
+            <div class="tab" onclick="showTab(event, 'distance')">Distance</div>
         </div>
         
         <!-- Devices Tab -->
@@ -459,7 +572,17 @@ HTML_PAGE = '''
         <div id="alertsTab" class="tab-content">
             <div class="alert-log">
                 <h3>Recent Activity</h3>
-                <div id="alertList"></div>
+                <p id="alertEmpty">No activity recorded yet.</p>
+                <div id="alertList" class="alert-viewport">
+                    <div id="alertSizer"></div>
+                </div>
+                <template id="alertRowTpl">
+                    <div class="alert-entry">
+                        <div class="alert-time"></div>
+                        <div class="alert-body"></div>
+                        <div class="alert-meta"></div>
+                    </div>
+                </template>
             </div>
         </div>
         
@@ -504,7 +627,10 @@ HTML_PAGE = '''
                     
                     <label>Distance Alert Threshold (meters):</label>
                     <input type="number" id="distanceThreshold" value="50" min="10" max="200">
-                    
+
+                    <label>Scan Concurrency (parallel probes):</label>
+                    <input type="number" id="scanConcurrency" value="128" min="1" max="512">
+
                     <button onclick="updateCalibration()">Update Calibration</button>
                 </div>
             </div>
@@ -591,7 +717,8 @@ HTML_PAGE = '''
         };
         let calibration = {
             referenceRSSI: -40,
-            pathLossExponent: 2.0
+            pathLossExponent: 2.0,
+            scanConcurrency: 128
         };
 
         // Load settings from localStorage
@@ -638,6 +765,23 @@ HTML_PAGE = '''
             return 1;
         }
 
+        // Static fragments of the device card - built once, not per device per refresh
+        const DISTANCE_SCALE_HTML = `
+                        <div style="text-align: center; margin-top: 5px; font-size: 12px; color: #666;">
+                            0m — 25m — 50m — 75m — 100m
+                        </div>`;
+        const _signalHtmlCache = {};
+        function signalBarsHTML(bars, weak) {
+            const key = bars + (weak ? 'w' : '');
+            if (_signalHtmlCache[key]) return _signalHtmlCache[key];
+            let html = '';
+            for (let i = 1; i <= 5; i++) {
+                const cls = i <= bars ? (weak ? 'weak' : 'active') : '';
+                html += `<div class="signal-bar ${cls}" style="height: ${i * 6}px;"></div>`;
+            }
+            return _signalHtmlCache[key] = html;
+        }
+
         async function scanNetwork() {
             const btn = document.getElementById('scanBtn');
             btn.disabled = true;
@@ -690,13 +834,7 @@ HTML_PAGE = '''
                 return;
             }
             
-            // Sort: monitored first, then online, then by name
-            devices.sort((a, b) => {
-                if (a.monitored !== b.monitored) return b.monitored - a.monitored;
-                if (a.online !== b.online) return b.online - a.online;
-                return (a.custom_name || a.hostname || a.ip).localeCompare(b.custom_name || b.hostname || b.ip);
-            });
-            
+            // /devices already returns monitored-first, online-first, by name
             container.innerHTML = devices.map(device => {
                 const name = device.custom_name || device.hostname || 'Unknown Device';
                 const statusClass = device.online ? 'online' : 'offline';
@@ -709,15 +847,8 @@ HTML_PAGE = '''
                     const signalBars = getSignalBars(device.rssi);
                     const distancePercent = Math.min(100, (distance / 100) * 100);
                     
-                    // Signal bars
-                    let signalHTML = '';
-                    for (let i = 1; i <= 5; i++) {
-                        const height = i * 6;
-                        const active = i <= signalBars;
-                        const weak = device.rssi < -70;
-                        signalHTML += `<div class="signal-bar ${active ? (weak ? 'weak' : 'active') : ''}" style="height: ${height}px;"></div>`;
-                    }
-                    
+                    const signalHTML = signalBarsHTML(signalBars, device.rssi < -70);
+
                     distanceHTML = `
                         <div class="device-info">
                             <div><strong>Distance:</strong> ${distance}m <span class="distance-badge distance-${zone}">${zone.toUpperCase()}</span></div>
@@ -730,10 +861,7 @@ HTML_PAGE = '''
                         <div class="distance-meter">
                             <div class="distance-fill" style="width: ${distancePercent}%"></div>
                             <div class="distance-marker" style="left: ${distancePercent}%"></div>
-                        </div>
-                        <div style="text-align: center; margin-top: 5px; font-size: 12px; color: #666;">
-                            0m — 25m — 50m — 75m — 100m
-                        </div>
+                        </div>${DISTANCE_SCALE_HTML}
                     `;
                 }
                 
@@ -833,8 +961,8 @@ HTML_PAGE = '''
                     // Show notification
                     showNotification(latestAlert);
                 }
-                
-                alerts = newAlerts;
+
+                setAlerts(newAlerts);
                 displayAlerts();
                 
             } catch (error) {
@@ -846,53 +974,132 @@ HTML_PAGE = '''
             console.log(`ALERT: ${alert.device_name} - ${alert.message || (alert.type === 'departure' ? 'has left' : 'has arrived')}`);
         }
 
+        // Virtualized alert list: only the rows in (and just around) the
+        // viewport exist as DOM nodes, recycled RecyclerView-style, so the
+        // full 1000-entry history renders in constant time.
+        const ALERT_ROW_H = 80;
+        const alertViewport = document.getElementById('alertList');
+        const alertSizer = document.getElementById('alertSizer');
+        const alertEmpty = document.getElementById('alertEmpty');
+        const _alertRowPool = [];
+        let _alertScrollQueued = false;
+
+        const _alertRowTpl = document.getElementById('alertRowTpl');
+
+        function _makeAlertRow() {
+            const row = _alertRowTpl.content.firstElementChild.cloneNode(true);
+            row.style.height = (ALERT_ROW_H - 6) + 'px';
+            alertSizer.appendChild(row);
+            return row;
+        }
+
+        function _fillAlertRow(row, alert, index) {
+            let cssClass = alert.type === 'arrival' ? ' arrival' : '';
+            cssClass = alert.type === 'distance' ? ' distance' : cssClass;
+            const icon = alert.type === 'arrival' ? '✅' :
+                       alert.type === 'distance' ? '📍' : '🚪';
+
+            row.className = 'alert-entry' + cssClass;
+            row.style.transform = `translateY(${index * ALERT_ROW_H}px)`;
+            row.children[0].textContent = new Date(alert.timestamp).toLocaleString();
+            row.children[1].textContent = `${icon} ${alert.message || `${alert.device_name} ${alert.type === 'departure' ? 'has left' : 'has arrived'}`}`;
+            row.children[2].textContent = `${alert.ip} - ${alert.mac || 'No MAC'}`;
+        }
+
         function displayAlerts() {
-            const container = document.getElementById('alertList');
-            
-            if (alerts.length === 0) {
-                container.innerHTML = '<p>No activity recorded yet.</p>';
-                return;
+            alertEmpty.style.display = alerts.length === 0 ? '' : 'none';
+            alertSizer.style.height = (alerts.length * ALERT_ROW_H) + 'px';
+
+            const start = Math.max(0, Math.floor(alertViewport.scrollTop / ALERT_ROW_H) - 2);
+            // clientHeight reads 0 while the tab is display:none (which
+            // is when polls render) - fall back to the CSS height
+            const count = Math.ceil((alertViewport.clientHeight || 400) / ALERT_ROW_H) + 4;
+            const end = Math.min(alerts.length, start + count);
+
+            while (_alertRowPool.length < count) {
+                _alertRowPool.push(_makeAlertRow());
+            }
+
+            for (let i = 0; i < _alertRowPool.length; i++) {
+                const row = _alertRowPool[i];
+                const idx = start + i;
+                if (idx < end) {
+                    row.style.display = '';
+                    _fillAlertRow(row, alerts[idx], idx);
+                } else {
+                    row.style.display = 'none';
+                }
             }
-            
-            container.innerHTML = alerts.slice(0, 50).map(alert => {
-                const time = new Date(alert.timestamp).toLocaleString();
-                let cssClass = alert.type === 'arrival' ? 'arrival' : '';
-                cssClass = alert.type === 'distance' ? 'distance' : cssClass;
-                const icon = alert.type === 'arrival' ? '✅' : 
-                           alert.type === 'distance' ? '📍' : '🚪';
-                
-                return `
-                    <div class="alert-entry ${cssClass}">
-                        <div class="alert-time">${time}</div>
-                        <div>${icon} ${alert.message || `${alert.device_name} ${alert.type === 'departure' ? 'has left' : 'has arrived'}`}</div>
-                        <div style="font-size: 12px; color: #999;">${alert.ip} - ${alert.mac || 'No MAC'}</div>
-                    </div>
-                `;
-            }).join('');
+        }
+
+        // Coalesce scroll events into one repaint per frame
+        alertViewport.addEventListener('scroll', () => {
+            if (_alertScrollQueued) return;
+            _alertScrollQueued = true;
+            requestAnimationFrame(() => {
+                _alertScrollQueued = false;
+                displayAlerts();
+            });
+        });
+
+        // One O(alerts) pass over today's alerts, memoized so repeat calls
+        // in the same tick (refresh + clear both repaint) reuse the map.
+        // alerts is newest-first: the first departure seen is the latest,
+        // and overwriting arrival each time leaves the earliest.
+        let _attendanceMemo = { key: null, byIp: null };
+        const _attendanceRows = new Map();
+
+        // Single entry point for replacing the alert array - the /alerts
+        // poll hands us a whole new array, so this is where the derived
+        // attendance index gets invalidated (the memo key alone can't
+        // tell two different arrays of the same length apart)
+        function setAlerts(newAlerts) {
+            alerts = newAlerts;
+            _attendanceMemo = { key: null, byIp: null };
+        }
+        const ATTENDANCE_COLS = ['name', 'device', 'arrival', 'departure', 'duration'];
+
+        function _attendanceIndex() {
+            // Integer day-bucket compare instead of toDateString(): one
+            // Date.parse per alert (cached on the object), no Date churn
+            const now = new Date();
+            const tzOff = now.getTimezoneOffset() * 60000;
+            const todayBucket = Math.floor((now.getTime() - tzOff) / 86400000);
+            const key = alerts.length + '|' + todayBucket;
+            if (_attendanceMemo.key === key) return _attendanceMemo.byIp;
+
+            const byIp = new Map();
+            for (const a of alerts) {
+                if (a.type !== 'arrival' && a.type !== 'departure') continue;
+                const ts = (a._ts ??= Date.parse(a.timestamp));
+                if (Math.floor((ts - tzOff) / 86400000) !== todayBucket) continue;
+                let entry = byIp.get(a.ip);
+                if (!entry) {
+                    entry = { firstArrival: null, lastDeparture: null };
+                    byIp.set(a.ip, entry);
+                }
+                if (a.type === 'arrival') {
+                    entry.firstArrival = new Date(ts);
+                } else if (!entry.lastDeparture) {
+                    entry.lastDeparture = new Date(ts);
+                }
+            }
+            _attendanceMemo = { key: key, byIp: byIp };
+            return byIp;
         }
 
         function updateAttendance() {
             const tbody = document.getElementById('attendanceTable');
-            const today = new Date().toDateString();
-            
-            // Get today's attendance from devices and alerts
+            const byIp = _attendanceIndex();
+
+            // Get today's attendance from devices and the prebuilt index
             const attendance = devices
                 .filter(d => d.monitored)
                 .map(device => {
-                    const arrivals = alerts.filter(a => 
-                        a.ip === device.ip && 
-                        a.type === 'arrival' && 
-                        new Date(a.timestamp).toDateString() === today
-                    );
-                    const departures = alerts.filter(a => 
-                        a.ip === device.ip && 
-                        a.type === 'departure' && 
-                        new Date(a.timestamp).toDateString() === today
-                    );
-                    
-                    const firstArrival = arrivals.length > 0 ? new Date(arrivals[arrivals.length - 1].timestamp) : null;
-                    const lastDeparture = departures.length > 0 ? new Date(departures[0].timestamp) : null;
-                    
+                    const entry = byIp.get(device.ip);
+                    const firstArrival = entry ? entry.firstArrival : null;
+                    const lastDeparture = entry ? entry.lastDeparture : null;
+
                     let duration = '';
                     if (firstArrival && lastDeparture) {
                         const diff = lastDeparture - firstArrival;
@@ -907,6 +1114,7 @@ HTML_PAGE = '''
                     }
                     
                     return {
+                        ip: device.ip,
                         name: device.custom_name || device.hostname || 'Unknown',
                         device: device.device_type || 'Unknown',
                         arrival: firstArrival ? firstArrival.toLocaleTimeString() : '-',
@@ -914,26 +1122,59 @@ HTML_PAGE = '''
                         duration: duration || '-'
                     };
                 });
-            
-            tbody.innerHTML = attendance.map(a => `
-                <tr>
-                    <td>${a.name}</td>
-                    <td>${a.device}</td>
-                    <td>${a.arrival}</td>
-                    <td>${a.departure}</td>
-                    <td>${a.duration}</td>
-                </tr>
-            `).join('');
-        }
-
-        function showTab(tab) {
+
+            // Update rows in place keyed by ip - only cells whose text
+            // actually changed are touched, new rows land in one fragment
+            const frag = document.createDocumentFragment();
+            const seen = new Set();
+            for (const a of attendance) {
+                seen.add(a.ip);
+                let tr = _attendanceRows.get(a.ip);
+                if (!tr) {
+                    tr = document.createElement('tr');
+                    for (let i = 0; i < ATTENDANCE_COLS.length; i++) {
+                        tr.appendChild(document.createElement('td'));
+                    }
+                    tr._cached = {};
+                    _attendanceRows.set(a.ip, tr);
+                    frag.appendChild(tr);
+                }
+                for (let i = 0; i < ATTENDANCE_COLS.length; i++) {
+                    const col = ATTENDANCE_COLS[i];
+                    if (tr._cached[col] !== a[col]) {
+                        tr.children[i].textContent = a[col];
+                        tr._cached[col] = a[col];
+                    }
+                }
+            }
+            if (frag.childNodes.length) tbody.appendChild(frag);
+
+            // Drop rows for devices no longer monitored
+            for (const [ip, tr] of _attendanceRows) {
+                if (!seen.has(ip)) {
+                    tr.remove();
+                    _attendanceRows.delete(ip);
+                }
+            }
+        }
+
+        // Looked up once - the tab strip never changes after load
+        const _tabs = document.querySelectorAll('.tab');
+        const _tabContents = document.querySelectorAll('.tab-content');
+
+        function showTab(event, tab) {
             // Update tab buttons
-            document.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));
+            _tabs.forEach(t => t.classList.remove('active'));
             event.target.classList.add('active');
-            
+
             // Update tab content
-            document.querySelectorAll('.tab-content').forEach(t => t.classList.remove('active'));
+            _tabContents.forEach(t => t.classList.remove('active'));
             document.getElementById(tab + 'Tab').classList.add('active');
+
+            // Re-window now that the viewport has real dimensions
+            if (tab === 'alerts') {
+                displayAlerts();
+            }
         }
 
         function editDevice(ip) {
@@ -1027,6 +1268,7 @@ HTML_PAGE = '''
         function updateCalibration() {
             calibration.referenceRSSI = parseFloat(document.getElementById('refRSSI').value);
             calibration.pathLossExponent = parseFloat(document.getElementById('pathLossExp').value);
+            calibration.scanConcurrency = parseInt(document.getElementById('scanConcurrency').value);
             settings.distanceThreshold = parseFloat(document.getElementById('distanceThreshold').value);
             
             localStorage.setItem('wifiCalibration', JSON.stringify(calibration));
@@ -1055,7 +1297,7 @@ HTML_PAGE = '''
         async function clearAlerts() {
             if (confirm('Clear all alerts?')) {
                 await fetch('/clear_alerts', { method: 'POST' });
-                alerts = [];
+                setAlerts([]);
                 displayAlerts();
                 updateAttendance();
             }
@@ -1071,6 +1313,7 @@ HTML_PAGE = '''
         // Initialize calibration form
         document.getElementById('refRSSI').value = calibration.referenceRSSI;
         document.getElementById('pathLossExp').value = calibration.pathLossExponent;
+        document.getElementById('scanConcurrency').value = calibration.scanConcurrency || 128;
         document.getElementById('distanceThreshold').value = settings.distanceThreshold || 50;
         document.getElementById('enableDistance').checked = settings.enableDistance || false;
         distanceMode = settings.enableDistance || false;
@@ -1082,7 +1325,7 @@ HTML_PAGE = '''
         
         // Load alerts
         fetch('/alerts').then(r => r.json()).then(a => {
-            alerts = a;
+            setAlerts(a);
             displayAlerts();
         });
     </script>
@@ -1090,6 +1333,12 @@ HTML_PAGE = '''
 </html>
 '''
 
+# The dashboard has no server-side variables - encode (and compress) it
+# once at import instead of re-encoding per request
+_HTML_BYTES = HTML_PAGE.encode('utf-8')
+_HTML_GZ = gzip.compress(_HTML_BYTES, 9)
+_HTML_ETAG = hashlib.md5(_HTML_BYTES).hexdigest()
+
 # MAC vendors database
 MAC_VENDORS = {
     '60:CF:84': 'ASUS',
@@ -1110,59 +1359,191 @@ MAC_VENDORS = {
     'E4:5F:01': 'Raspberry Pi',
 }
 
+# Normalize the OUI keys once and freeze the table - lookups then need a
+# single dict probe on an upper-cased prefix, whatever case the platform
+# ARP output used
+_OUI_TABLE = {k.upper(): v for k, v in MAC_VENDORS.items()}
+MAC_VENDORS = types.MappingProxyType(_OUI_TABLE)
+
+# Startup banner, UTF-8-encoded once at import; the dynamic fields are
+# spliced in with bytes %-formatting (PEP 461) so a restart loop never
+# re-encodes the static text
+_BANNER_HEAD = (
+    "\n" + "=" * 60 +
+    "\nComplete Network Monitor (%b)\n" +
+    "=" * 60 +
+    "\nFeatures: Attendance Tracking + Distance Estimation"
+).encode('utf-8')
+
+_BANNER_STATIC = (
+    "\n\n📡 Distance Estimation:\n"
+    "- Based on WiFi signal strength (RSSI)\n"
+    "- Accuracy: ±5-20m depending on environment\n"
+    "- Calibrate for your specific location\n"
+    "\n🎯 Distance Zones:\n"
+    "- On-site: 0-10m\n"
+    "- Near-site: 10-30m\n"
+    "- Leaving: 30-50m\n"
+    "- Away: >50m\n"
+).encode('utf-8')
+
+_BANNER_NO_PORT = "\n❌ No available ports!\n".encode('utf-8')
+_MSG_STOPPED = b"\n\nStopped\n"
+_MSG_ERROR = "\n❌ Error: %b\n".encode('utf-8')
+_MSG_SUDO_HINT = b"Try running with sudo: sudo python3 script.py\n"
+
+# One dict probe picks the platform blurb - no branch chain, and the
+# text is already encoded like the rest of the banner
+PLATFORM_NOTES = {
+    'Linux': ("\n\n📝 Linux Notes:\n"
+              "- May need sudo for MAC address detection\n"
+              "- Install 'beep' for sound alerts: sudo apt-get install beep\n"
+              "- Ensure 'arp' or 'ip' commands are available"
+              ).encode('utf-8'),
+    'Darwin': ("\n\n📝 macOS Notes:\n"
+               "- Uses system sounds for alerts\n"
+               "- May need to allow network access in System Preferences"
+               ).encode('utf-8'),
+    'Windows': ("\n\n📝 Windows Notes:\n"
+                "- Run as Administrator for best results\n"
+                "- Windows Defender may prompt for network access"
+                ).encode('utf-8'),
+}
+
+# The head never varies at run time, so render it for this host at
+# import; main() only formats the port/address tail
+_BANNER_FOR_HOST = (_BANNER_HEAD % _PLATFORM.encode('utf-8')
+                    + PLATFORM_NOTES.get(_PLATFORM, b'') + _BANNER_STATIC)
+
+_BANNER_TAIL = (
+    "\n✅ Starting on port %b\n"
+    "\n📡 Access at:\n"
+    "   http://localhost:%b\n"
+    "   http://%b:%b\n"
+    "\n🌐 Monitoring network: %b.0/24\n"
+    "\n⚙️  Features:\n"
+    "   - Attendance tracking (arrival/departure)\n"
+    "   - Distance estimation (when enabled)\n"
+    "   - Cross-platform support\n"
+    "   - Sound alerts\n"
+    "   - CSV export\n"
+    "\nPress Ctrl+C to stop\n\n"
+).encode('utf-8')
+
 class CompleteNetworkMonitor:
     def __init__(self):
         self.devices = {}
         self.scanning = False
         self.monitoring = False
         self.distance_mode = False
-        self.alerts = []
+        self.alerts = deque(maxlen=1000)  # newest first, O(1) prepend + cap
         self.save_file = Path("device_monitor.json")
         self.alerts_file = Path("attendance_alerts.json")
         self.attendance_file = Path("attendance_log.csv")
-        self.platform = platform.system()
+        self.platform = _PLATFORM
+        self._arp_cache = {}
+        self._arp_cache_ts = 0.0
+        self._rssi_state = {}
+        self._last_rtts = {}
+        self._hostname_cache = {}
+        self._probe_ports = [80, 445, 22]
+        self._ip_list = []
+        self._ip_list_base = None
+        self._lock = threading.Lock()
+        self._devices_rev = 0
+        self._alerts_rev = 0
+        self._sorted_cache = None
         self.calibration = {
             'referenceRSSI': -40,
             'pathLossExponent': 2.0,
-            'distanceThreshold': 50
+            'distanceThreshold': 50,
+            'scanConcurrency': 128
         }
+        self._recalibrate()
         self.load_data()
-        
+
+        # One line-buffered handle for the monitor's lifetime instead of
+        # an open/close (plus an exists() stat) per logged alert
+        needs_header = not self.attendance_file.exists()
+        self._csv_fh = open(self.attendance_file, 'a', newline='', buffering=1)
+        self._csv_writer = csv.writer(self._csv_fh)
+        if needs_header:
+            self._csv_writer.writerow(['Timestamp', 'Type', 'Name', 'IP',
+                                       'MAC', 'Device Type', 'Message'])
+        atexit.register(self._csv_fh.close)
+
+        # Writes are debounced: mutation sites flag the store dirty and a
+        # background thread coalesces bursts into one write per store
+        self._dirty = threading.Event()
+        self._dirty_devices = False
+        self._dirty_alerts = False
+        threading.Thread(target=self._flush_loop, daemon=True).start()
+        atexit.register(self._save_now)
+
     def load_data(self):
         """Load saved data"""
         # Load devices
         if self.save_file.exists():
             try:
-                with open(self.save_file, 'r') as f:
-                    saved = json.load(f)
-                    for ip, data in saved.items():
-                        self.devices[ip] = data
+                for ip, data in self._read_json(self.save_file).items():
+                    self.devices[ip] = data
             except:
                 pass
-        
+
         # Load alerts
         if self.alerts_file.exists():
             try:
-                with open(self.alerts_file, 'r') as f:
-                    self.alerts = json.load(f)
+                self.alerts = deque(self._read_json(self.alerts_file),
+                                    maxlen=1000)
             except:
-                self.alerts = []
+                self.alerts = deque(maxlen=1000)
     
-    def save_data(self):
-        """Save device data"""
-        with open(self.save_file, 'w') as f:
-            json.dump(self.devices, f, indent=2)
-        
-        with open(self.alerts_file, 'w') as f:
-            json.dump(self.alerts, f, indent=2)
+    def save_data(self, devices=True, alerts=True):
+        """Mark stores dirty - the flush thread does the actual writes"""
+        if devices:
+            self._dirty_devices = True
+        if alerts:
+            self._dirty_alerts = True
+        self._dirty.set()
+
+    def _flush_loop(self):
+        while True:
+            self._dirty.wait()
+            time.sleep(2)  # let a burst of alerts coalesce
+            self._dirty.clear()
+            devices, alerts = self._dirty_devices, self._dirty_alerts
+            self._dirty_devices = self._dirty_alerts = False
+            self._save_now(devices=devices, alerts=alerts)
+
+    def _save_now(self, devices=True, alerts=True):
+        """Write the JSON stores atomically, right now"""
+        if devices:
+            with self._lock:
+                payload = dict(self.devices)
+            self._write_json(self.save_file, payload)
+
+        if alerts:
+            self._write_json(self.alerts_file, list(self.alerts))
+
+    def _read_json(self, path):
+        """Load a JSON store (orjson when installed)"""
+        data = path.read_bytes()
+        return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
+    def _write_json(self, path, data):
+        """Compact dump to a temp file, then atomic rename into place"""
+        tmp = str(path) + '.tmp'
+        if HAS_ORJSON:
+            with open(tmp, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(tmp, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp, path)
     
     def get_vendor(self, mac):
         """Get vendor from MAC"""
-        if not mac:
-            return None
-        
-        oui = mac[:8]
-        return MAC_VENDORS.get(oui)
+        return _OUI_TABLE.get(mac[:8].upper()) if mac else None
     
     def get_local_network(self):
         """Get network info - cross platform"""
@@ -1179,135 +1560,307 @@ class CompleteNetworkMonitor:
         except:
             return "192.168.1", "192.168.1.1"
     
+    def _ping_cmd(self, ip):
+        """Build the platform ping command for a single probe"""
+        if self.platform == 'Windows':
+            return ['ping', '-4', '-n', '1', '-w', '1000', ip]
+        else:  # Linux/Mac ('-n' skips the reverse-DNS lookup per probe)
+            return ['ping', '-n', '-c', '1', '-W', '1', ip]
+
     def ping(self, ip):
         """Cross-platform quick ping"""
         try:
-            if self.platform == 'Windows':
-                cmd = ['ping', '-n', '1', '-w', '200', ip]
-            else:  # Linux/Mac
-                cmd = ['ping', '-c', '1', '-W', '1', ip]
-            
-            result = subprocess.run(cmd, capture_output=True, timeout=1)
+            result = subprocess.run(self._ping_cmd(ip), capture_output=True,
+                                    timeout=1, **_SPAWN_KW)
             return result.returncode == 0
         except:
             return False
+
+    def _tcp_probe(self, ip):
+        """Prove a host exists with a non-blocking TCP SYN, no subprocess.
+
+        Any writable result - even a refused connection - means something
+        answered at that address, which is all the sweep needs to know.
+        """
+        for port in self._probe_ports:
+            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            s.setblocking(False)
+            try:
+                err = s.connect_ex((ip, port))
+                if err == 0:
+                    return True
+                _, writable, _ = select.select([], [s], [], 0.2)
+                if writable:
+                    # Connected or refused - either way the host is up
+                    return True
+            except OSError:
+                pass
+            finally:
+                s.close()
+        return False
+
+    def _broadcast_probe(self, base):
+        """Nudge the whole subnet with one broadcast datagram.
+
+        Hosts answering the broadcast land in the kernel ARP cache
+        before the sweep even starts, so slow responders are often
+        already resolved by the time we ping them.
+        """
+        try:
+            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+            s.sendto(b'', (f"{base}.255", 9))  # discard port
+            s.close()
+        except:
+            pass
+
+    def _icmp_checksum(self, data):
+        """RFC 1071 ones-complement checksum"""
+        if len(data) == _ICMP_PKT_LEN:
+            total = sum(_ICMP_WORDS.unpack_from(data))
+        else:
+            if len(data) % 2:
+                data = bytes(data) + b'\x00'
+            total = sum(struct.unpack('!%dH' % (len(data) // 2), data))
+        total = (total >> 16) + (total & 0xffff)
+        total += total >> 16
+        return ~total & 0xffff
+
+    def _raw_icmp_sweep(self, ips, timeout=2.0):
+        """Sweep with one raw ICMP socket, demuxing replies by ident"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+        sock.setblocking(False)
+
+        sel = selectors.DefaultSelector()
+        sel.register(sock, selectors.EVENT_READ)
+
+        pid = os.getpid()
+        pending = {}  # ident -> ip
+        alive = set()
+        # One buffer for the whole sweep - only ident/seq/checksum change
+        packet = bytearray(_ICMP_PKT_LEN)
+        try:
+            for seq, ip in enumerate(ips):
+                ident = (pid ^ seq) & 0xffff
+                _ICMP_HDR.pack_into(packet, 0, 8, 0, 0, ident, seq & 0xffff)
+                checksum = self._icmp_checksum(packet)
+                _ICMP_HDR.pack_into(packet, 0, 8, 0, checksum,
+                                    ident, seq & 0xffff)
+                try:
+                    sock.sendto(packet, (ip, 0))
+                    pending[ident] = ip
+                except OSError:
+                    continue
+
+            deadline = time.time() + timeout
+            while pending:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                if not sel.select(remaining):
+                    continue
+                try:
+                    data, _ = sock.recvfrom(1024)
+                except OSError:
+                    continue
+                # 20-byte IP header, then echo reply (type 0) with our ident
+                if len(data) < 28 or data[20] != 0:
+                    continue
+                ident = struct.unpack_from('!H', data, 24)[0]
+                ip = pending.pop(ident, None)
+                if ip:
+                    alive.add(ip)
+        finally:
+            sel.close()
+            sock.close()
+
+        return alive
+
+    def _ping_sweep(self, ips):
+        """Ping all hosts concurrently, return the set of responding IPs"""
+        limit = int(self.calibration.get('scanConcurrency') or 128)
+        self._last_rtts = {}
+
+        if HAS_ICMPLIB:
+            try:
+                hosts = asyncio.run(async_multiping(
+                    ips, count=1, interval=0.01, timeout=1,
+                    concurrent_tasks=limit, privileged=False))
+                # Exact per-host RTTs come for free - keep them so
+                # distance mode can skip its own sampling round
+                self._last_rtts = {h.address: h.avg_rtt
+                                   for h in hosts if h.is_alive}
+                return {h.address for h in hosts if h.is_alive}
+            except SocketPermissionError:
+                # Unprivileged ICMP sockets not allowed - use /bin/ping
+                pass
+
+        try:
+            return self._raw_icmp_sweep(ips)
+        except OSError:
+            # Raw sockets need root/CAP_NET_RAW - fall back to /bin/ping
+            pass
+
+        async def sweep():
+            sem = asyncio.Semaphore(limit)
+
+            async def ping_one(ip):
+                async with sem:
+                    # Tiny stagger so the kernel doesn't drop bursty ICMP
+                    await asyncio.sleep(0.01)
+                    proc = await asyncio.create_subprocess_exec(
+                        *self._ping_cmd(ip),
+                        stdout=asyncio.subprocess.DEVNULL,
+                        stderr=asyncio.subprocess.DEVNULL)
+                    try:
+                        code = await asyncio.wait_for(proc.wait(), timeout=2)
+                    except asyncio.TimeoutError:
+                        proc.kill()
+                        return ip, False
+                    return ip, code == 0
+
+            results = await asyncio.gather(*(ping_one(ip) for ip in ips))
+            return {ip for ip, ok in results if ok}
+
+        try:
+            return asyncio.run(sweep())
+        except:
+            # No usable event loop - TCP probes from a thread pool still
+            # beat forking /bin/ping once per host
+            with ThreadPoolExecutor(max_workers=limit) as pool:
+                results = pool.map(self._tcp_probe, ips)
+            return {ip for ip, ok in zip(ips, results) if ok}
     
     def ping_with_stats(self, ip):
         """Ping with response time for RSSI estimation"""
         try:
             if self.platform == 'Windows':
-                cmd = ['ping', '-n', '5', '-w', '500', ip]
+                cmd = ['ping', '-4', '-n', '5', '-w', '500', ip]
             else:
-                cmd = ['ping', '-c', '5', '-W', '1', ip]
+                cmd = ['ping', '-n', '-c', '5', '-W', '1', ip]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=3)
+            result = subprocess.run(cmd, capture_output=True, text=True,
+                                    timeout=3, **_SPAWN_KW)
             
             if result.returncode == 0:
                 # Extract average response time
                 if self.platform == 'Windows':
-                    avg_match = re.search(r'Average = (\d+)ms', result.stdout)
+                    avg_match = _WIN_AVG_RE.search(result.stdout)
                 else:
-                    avg_match = re.search(r'avg/([\d.]+)/', result.stdout)
+                    avg_match = _NIX_AVG_RE.search(result.stdout)
                 
                 if avg_match:
-                    avg_time = float(avg_match.group(1))
-                    
-                    # Estimate RSSI from response time
-                    if avg_time < 2:
-                        return -40  # Very strong
-                    elif avg_time < 5:
-                        return -50  # Strong
-                    elif avg_time < 10:
-                        return -60  # Good
-                    elif avg_time < 20:
-                        return -70  # Fair
-                    elif avg_time < 50:
-                        return -80  # Weak
-                    else:
-                        return -90  # Very weak
+                    return self._rssi_from_rtt(float(avg_match.group(1)))
         except:
             pass
-        
+
         return -70  # Default
+
+    def _rssi_from_rtt(self, avg_time):
+        """Estimate RSSI from average response time (ms)"""
+        if avg_time < 2:
+            return -40  # Very strong
+        elif avg_time < 5:
+            return -50  # Strong
+        elif avg_time < 10:
+            return -60  # Good
+        elif avg_time < 20:
+            return -70  # Fair
+        elif avg_time < 50:
+            return -80  # Weak
+        else:
+            return -90  # Very weak
     
+    def _refresh_arp(self):
+        """Read the whole OS ARP/neighbor table in one subprocess call"""
+        table = {}
+        try:
+            if self.platform == 'Linux':
+                out = subprocess.check_output(['ip', 'neighbor', 'show'],
+                                              timeout=5, **_SPAWN_KW)
+            else:  # Windows/macOS
+                out = subprocess.check_output(['arp', '-a'],
+                                              timeout=5, **_SPAWN_KW)
+        except:
+            return table
+
+        # One pass over the raw bytes - only matches get decoded
+        for m in _ARP_LINE_RE.finditer(out):
+            ip = m.group(1).decode('ascii')
+            table[ip] = m.group(2).decode('ascii').upper().replace('-', ':')
+
+        self._arp_cache = table
+        self._arp_cache_ts = time.time()
+        return table
+
     def get_hostname(self, ip):
-        """Get hostname - cross platform"""
+        """Get hostname - cross platform, cached for an hour"""
+        now = time.time()
+        cached = self._hostname_cache.get(ip)
+        if cached and now - cached[0] < 3600:
+            return cached[1]
+
         try:
-            return socket.gethostbyaddr(ip)[0].split('.')[0]
+            hostname = socket.gethostbyaddr(ip)[0].split('.')[0]
         except:
-            return None
+            hostname = None
+
+        # Cache failures too - unresolvable hosts block the longest
+        self._hostname_cache[ip] = (now, hostname)
+        return hostname
     
     def get_mac(self, ip):
-        """Get MAC address - cross platform"""
-        try:
-            # First ping to ensure ARP entry
-            if self.platform == 'Windows':
-                subprocess.run(['ping', '-n', '1', '-w', '100', ip], 
-                             capture_output=True, timeout=0.5)
-            else:
-                subprocess.run(['ping', '-c', '1', '-W', '1', ip], 
-                             capture_output=True, timeout=0.5)
-            
-            # Get ARP table
-            if self.platform == 'Windows':
-                result = subprocess.run(['arp', '-a'], capture_output=True, text=True)
-                # Windows format
-                for line in result.stdout.split('\n'):
-                    if ip in line:
-                        parts = line.split()
-                        for part in parts:
-                            if '-' in part and len(part) == 17:
-                                return part.upper().replace('-', ':')
-            
-            elif self.platform == 'Linux':
-                # Try ip neighbor first
-                try:
-                    result = subprocess.run(['ip', 'neighbor', 'show'], 
-                                          capture_output=True, text=True)
-                    for line in result.stdout.split('\n'):
-                        if ip in line and 'lladdr' in line:
-                            parts = line.split()
-                            idx = parts.index('lladdr')
-                            if idx + 1 < len(parts):
-                                return parts[idx + 1].upper()
-                except:
-                    # Fallback to arp
-                    result = subprocess.run(['arp', '-n'], capture_output=True, text=True)
-                    for line in result.stdout.split('\n'):
-                        if ip in line:
-                            mac_match = re.search(r'([0-9a-fA-F]{2}:){5}[0-9a-fA-F]{2}', line)
-                            if mac_match:
-                                return mac_match.group(0).upper()
-            
-            elif self.platform == 'Darwin':  # macOS
-                result = subprocess.run(['arp', '-n', ip], capture_output=True, text=True)
-                mac_match = re.search(r'([0-9a-fA-F]{1,2}:){5}[0-9a-fA-F]{1,2}', result.stdout)
-                if mac_match:
-                    return mac_match.group(0).upper()
-                    
-        except:
-            pass
-        return None
+        """Get MAC address from the cached ARP table.
+
+        The sweep already warmed the kernel table and _refresh_arp()
+        parsed it wholesale, so a miss here only triggers one reparse
+        per 30s window - never a per-IP ping/arp subprocess pair.
+        """
+        mac = self._arp_cache.get(ip)
+        if mac:
+            return mac
+        if time.time() - self._arp_cache_ts > 30:
+            self._refresh_arp()
+        return self._arp_cache.get(ip)
     
+    def _recalibrate(self):
+        """Fold the calibration constants into two cached scalars.
+
+        Called whenever calibration changes so the per-host distance
+        conversion is just subtract, multiply, exp.
+        """
+        self._ref = self.calibration['referenceRSSI']
+        self._log10_over_denom = math.log(10) / (
+            10.0 * self.calibration['pathLossExponent'])
+
     def calculate_distance(self, rssi):
         """Calculate distance from RSSI"""
         if rssi and rssi != 0:
-            distance = math.pow(10, (self.calibration['referenceRSSI'] - rssi) / (10 * self.calibration['pathLossExponent']))
-            return round(distance, 1)
+            return round(math.exp((self._ref - rssi) * self._log10_over_denom), 1)
         return None
     
+    def _smooth_rssi(self, ip, rssi, alpha=0.4):
+        """EWMA filter - raw RSSI is too noisy to invert directly"""
+        prev = self._rssi_state.get(ip)
+        smoothed = rssi if prev is None else alpha * rssi + (1 - alpha) * prev
+        self._rssi_state[ip] = smoothed
+        return round(smoothed, 1)
+
+    def calculate_distances(self, rssis):
+        """Vectorized RSSI -> distance for a whole scan's worth of hosts"""
+        if HAS_NUMPY and len(rssis) > 1:
+            # float64, so the values match the scalar path exactly -
+            # float32 rounds to noise like 316.20001220703125
+            arr = np.asarray(rssis, dtype=np.float64)
+            distances = np.exp((self._ref - arr) * self._log10_over_denom).round(1)
+            return [float(d) if r else None for d, r in zip(distances, rssis)]
+        return [self.calculate_distance(r) for r in rssis]
+
     def get_zone(self, distance):
         """Get zone from distance"""
         if not distance:
             return "unknown"
-        if distance < 10:
-            return "on-site"
-        elif distance < 30:
-            return "near-site"
-        elif distance < 50:
-            return "leaving"
-        else:
-            return "away"
+        return _ZONE_NAMES[bisect.bisect_right(_ZONE_BOUNDS, distance)]
     
     def play_alert_sound(self, frequency=1000, duration=0.2):
         """Cross-platform alert sound"""
@@ -1346,61 +1899,94 @@ class CompleteNetworkMonitor:
         previous_distances = {ip: device.get('estimated_distance') for ip, device in self.devices.items()}
         
         # Clear online status
-        for device in self.devices.values():
-            device['online'] = False
+        with self._lock:
+            for device in self.devices.values():
+                device['online'] = False
         
-        # Quick scan
+        # Quick concurrent sweep - the 254 address strings only need to
+        # be built when the subnet changes, not on every scan
+        if base != self._ip_list_base:
+            self._ip_list = [f"{base}.{i}" for i in range(1, 255)]
+            self._ip_list_base = base
+        ips = self._ip_list
+        self._broadcast_probe(base)
+        alive = self._ping_sweep(ips)
+
+        # The sweep just warmed the kernel ARP cache - grab the whole
+        # table once instead of shelling out per discovered host
+        self._refresh_arp()
+
+        # Resolve hostnames for new devices in parallel - reverse DNS can
+        # block for seconds per host on networks with slow resolvers
+        new_ips = [ip for ip in ips if ip in alive and ip not in self.devices]
+        hostnames = {}
+        if new_ips:
+            with ThreadPoolExecutor(max_workers=16) as pool:
+                hostnames = dict(zip(new_ips, pool.map(self.get_hostname, new_ips)))
+
         online_count = 0
-        for i in range(1, 255):
-            ip = f"{base}.{i}"
-            
-            if self.ping(ip):
+        for ip in ips:
+            if ip in alive:
                 online_count += 1
                 print(f"✓ {ip}")
-                
+
                 if ip not in self.devices:
                     # New device
                     mac = self.get_mac(ip)
-                    hostname = self.get_hostname(ip)
-                    
-                    self.devices[ip] = {
-                        'ip': ip,
-                        'mac': mac,
-                        'hostname': hostname,
-                        'vendor': self.get_vendor(mac),
-                        'first_seen': datetime.now().isoformat(),
-                        'monitored': False,
-                        'device_type': 'employee'
-                    }
+                    hostname = hostnames.get(ip)
+
+                    with self._lock:
+                        self.devices[ip] = {
+                            'ip': ip,
+                            'mac': mac,
+                            'hostname': hostname,
+                            'vendor': self.get_vendor(mac),
+                            'first_seen': datetime.now().isoformat(),
+                            'monitored': False,
+                            'device_type': 'employee'
+                        }
                 
                 self.devices[ip]['online'] = True
                 self.devices[ip]['last_seen'] = datetime.now().isoformat()
-                
-                # Distance estimation if enabled
-                if self.distance_mode:
-                    rssi = self.ping_with_stats(ip)
-                    distance = self.calculate_distance(rssi)
-                    
-                    self.devices[ip]['rssi'] = rssi
-                    self.devices[ip]['estimated_distance'] = distance
-                    
-                    # Check for distance changes
-                    if self.monitoring and previous_distances.get(ip) and distance:
-                        prev_distance = previous_distances[ip]
-                        if abs(distance - prev_distance) > 10:  # Significant change
-                            prev_zone = self.get_zone(prev_distance)
-                            new_zone = self.get_zone(distance)
-                            
-                            if prev_zone != new_zone:
-                                device = self.devices[ip]
-                                message = f"{device.get('custom_name', device.get('hostname', ip))} moved from {prev_zone} to {new_zone} ({int(prev_distance)}m → {int(distance)}m)"
-                                self.add_alert(device, 'distance', message)
-                                print(f"📍 DISTANCE: {message}")
-                                
-                                # Special alert for leaving site
-                                if distance > self.calibration.get('distanceThreshold', 50):
-                                    self.play_alert_sound(300, 0.5)  # Low long beep
-        
+
+        # Distance estimation if enabled - sample RSSI per host, then
+        # convert the whole batch in one vectorized pass
+        if self.distance_mode:
+            alive_ips = [ip for ip in ips if ip in alive]
+            if self._last_rtts:
+                # The icmplib sweep already measured exact RTTs
+                raw_rssis = [self._rssi_from_rtt(self._last_rtts.get(ip, 50.0))
+                             for ip in alive_ips]
+            else:
+                # Each RSSI sample is 5 pings (up to ~3s) - overlap them
+                with ThreadPoolExecutor(max_workers=16) as pool:
+                    raw_rssis = list(pool.map(self.ping_with_stats, alive_ips))
+            rssis = [self._smooth_rssi(ip, rssi)
+                     for ip, rssi in zip(alive_ips, raw_rssis)]
+            distances = self.calculate_distances(rssis)
+
+            for ip, rssi, distance in zip(alive_ips, rssis, distances):
+                self.devices[ip]['rssi'] = rssi
+                self.devices[ip]['estimated_distance'] = distance
+
+                # Check for distance changes
+                if self.monitoring and previous_distances.get(ip) and distance:
+                    prev_distance = previous_distances[ip]
+                    if abs(distance - prev_distance) > 10:  # Significant change
+                        prev_zone = self.get_zone(prev_distance)
+                        new_zone = self.get_zone(distance)
+
+                        if prev_zone != new_zone:
+                            device = self.devices[ip]
+                            message = f"{device.get('custom_name', device.get('hostname', ip))} moved from {prev_zone} to {new_zone} ({int(prev_distance)}m → {int(distance)}m)"
+                            self.add_alert(device, 'distance', message)
+                            print(f"📍 DISTANCE: {message}")
+
+                            # Special alert for leaving site
+                            if distance > self.calibration.get('distanceThreshold', 50):
+                                self.play_alert_sound(300, 0.5)  # Low long beep
+
+
         # Check for departures/arrivals if monitoring
         if self.monitoring:
             for ip, device in self.devices.items():
@@ -1421,9 +2007,63 @@ class CompleteNetworkMonitor:
                         self.play_alert_sound(1000, 0.2)  # High beep
         
         self.scanning = False
-        self.save_data()
+        self._devices_rev += 1
+        self.save_data(alerts=False)  # add_alert already persisted alerts
         print(f"Scan complete. {online_count} devices online")
     
+    def device_snapshot(self):
+        """Consistent copy of the device list for the API thread"""
+        with self._lock:
+            return [dict(d) for d in self.devices.values()]
+
+    def sorted_snapshot(self):
+        """Device list pre-sorted for the dashboard, cached per revision.
+
+        Monitored devices first, then online, then by display name -
+        the order the device grid wants, so clients don't re-sort on
+        every poll and the sort only reruns when something changed.
+        """
+        rev = self._devices_rev
+        if self._sorted_cache and self._sorted_cache[0] == rev:
+            return self._sorted_cache[1]
+
+        devices = self.device_snapshot()
+        devices.sort(key=lambda d: (
+            not d.get('monitored', False),
+            not d.get('online', False),
+            (d.get('custom_name') or d.get('hostname') or d['ip']).lower()
+        ))
+        self._sorted_cache = (rev, devices)
+        return devices
+
+    def get_stats(self):
+        """Aggregate device counters for dashboards in one pass"""
+        with self._lock:
+            devices = list(self.devices.values())
+
+        if HAS_NUMPY and devices:
+            online = np.fromiter((bool(d.get('online')) for d in devices),
+                                 dtype=bool, count=len(devices))
+            monitored = np.fromiter((bool(d.get('monitored')) for d in devices),
+                                    dtype=bool, count=len(devices))
+            dist = np.fromiter((d.get('estimated_distance') or math.inf
+                                for d in devices),
+                               dtype=np.float32, count=len(devices))
+            return {
+                'total': len(devices),
+                'online': int(online.sum()),
+                'monitored': int(monitored.sum()),
+                'onsite': int((dist < 10).sum())
+            }
+
+        return {
+            'total': len(devices),
+            'online': sum(1 for d in devices if d.get('online')),
+            'monitored': sum(1 for d in devices if d.get('monitored')),
+            'onsite': sum(1 for d in devices
+                          if (d.get('estimated_distance') or math.inf) < 10)
+        }
+
     def add_alert(self, device, alert_type, message=None):
         """Add attendance or distance alert"""
         alert = {
@@ -1438,40 +2078,30 @@ class CompleteNetworkMonitor:
         if message:
             alert['message'] = message
         
-        self.alerts.insert(0, alert)
-        
-        # Keep only last 1000 alerts
-        self.alerts = self.alerts[:1000]
+        self.alerts.appendleft(alert)  # maxlen drops the oldest for us
+        self._alerts_rev += 1
         
         # Log to CSV
         self.log_attendance(alert)
-        
-        self.save_data()
+
+        self.save_data(devices=False)
     
     def log_attendance(self, alert):
         """Log to attendance CSV"""
-        import csv
-        
-        file_exists = self.attendance_file.exists()
-        
-        with open(self.attendance_file, 'a', newline='') as f:
-            writer = csv.writer(f)
-            
-            if not file_exists:
-                writer.writerow(['Timestamp', 'Type', 'Name', 'IP', 'MAC', 'Device Type', 'Message'])
-            
-            writer.writerow([
-                alert['timestamp'],
-                alert['type'],
-                alert['device_name'],
-                alert['ip'],
-                alert.get('mac', ''),
-                alert.get('device_type', ''),
-                alert.get('message', '')
-            ])
+        self._csv_writer.writerow([
+            alert['timestamp'],
+            alert['type'],
+            alert['device_name'],
+            alert['ip'],
+            alert.get('mac', ''),
+            alert.get('device_type', ''),
+            alert.get('message', '')
+        ])
     
     def start_monitoring(self):
         """Start monitoring in background"""
+        if self.monitoring:
+            return  # already running - don't stack scan threads
         self.monitoring = True
         
         def monitor_loop():
@@ -1485,29 +2115,80 @@ class CompleteNetworkMonitor:
     def stop_monitoring(self):
         """Stop monitoring"""
         self.monitoring = False
+        self._save_now()
 
 # Create monitor instance
 monitor = CompleteNetworkMonitor()
 
 # Flask app
 app = Flask(__name__)
-CORS(app)
+# CORS headers only matter for the JSON/API endpoints; the dashboard
+# HTML is same-origin, so GET / skips the per-request header work
+CORS(app, resources={
+    r"/(devices|alerts|stats|scan|scan_with_distance|toggle_distance|"
+    r"update_device|update_calibration|start_monitoring|stop_monitoring|"
+    r"clear_alerts|export_attendance|platform_info)": {"origins": "*"}})
+
+def _encode_json(obj):
+    """Encode to JSON bytes - orjson when available"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj).encode('utf-8')
+
+def _json_response(obj, etag=None):
+    """jsonify replacement - orjson when available, ETag optional"""
+    resp = Response(_encode_json(obj), mimetype='application/json')
+    if etag:
+        resp.headers['ETag'] = etag
+    return resp
+
+# Encoded-payload caches for the polled endpoints, keyed by revision:
+# a poll that misses the 304 path still serves precomputed bytes
+_DEVICES_CACHE = {'rev': None, 'body': b''}
+_ALERTS_CACHE = {'rev': None, 'body': b''}
 
 @app.route('/')
 def index():
-    return HTML_PAGE
+    # Two representations live under one URL, so the ETag is suffixed
+    # per variant and Vary keeps shared caches from serving gzip to a
+    # client that didn't ask for it
+    gz = 'gzip' in request.headers.get('Accept-Encoding', '')
+    etag = _HTML_ETAG + '-gz' if gz else _HTML_ETAG
+    # The page bytes never change within a process - repeat opens from
+    # the same browser cost a header compare and an empty 304
+    if request.headers.get('If-None-Match') == etag:
+        return '', 304
+    headers = {'ETag': etag, 'Cache-Control': 'public, max-age=3600',
+               'Vary': 'Accept-Encoding'}
+    if gz:
+        headers['Content-Encoding'] = 'gzip'
+        return Response(_HTML_GZ, mimetype='text/html', headers=headers)
+    return Response(_HTML_BYTES, mimetype='text/html', headers=headers)
 
 @app.route('/platform_info')
 def platform_info():
     return jsonify({
-        'platform': f"{platform.system()} {platform.release()}",
+        'platform': f"{_PLATFORM} {platform.release()}",
         'python': platform.python_version(),
         'hostname': socket.gethostname()
     })
 
 @app.route('/devices')
 def get_devices():
-    return jsonify(list(monitor.devices.values()))
+    rev = monitor._devices_rev
+    etag = f'W/"{rev}"'
+    if request.headers.get('If-None-Match') == etag:
+        return '', 304
+    if _DEVICES_CACHE['rev'] != rev:
+        _DEVICES_CACHE['body'] = _encode_json(monitor.sorted_snapshot())
+        _DEVICES_CACHE['rev'] = rev
+    resp = Response(_DEVICES_CACHE['body'], mimetype='application/json')
+    resp.headers['ETag'] = etag
+    return resp
+
+@app.route('/stats')
+def get_stats():
+    return _json_response(monitor.get_stats())
 
 @app.route('/scan', methods=['POST'])
 def scan_network():
@@ -1530,7 +2211,16 @@ def toggle_distance():
 
 @app.route('/alerts')
 def get_alerts():
-    return jsonify(monitor.alerts)
+    rev = monitor._alerts_rev
+    etag = f'W/"{rev}"'
+    if request.headers.get('If-None-Match') == etag:
+        return '', 304
+    if _ALERTS_CACHE['rev'] != rev:
+        _ALERTS_CACHE['body'] = _encode_json(list(monitor.alerts))
+        _ALERTS_CACHE['rev'] = rev
+    resp = Response(_ALERTS_CACHE['body'], mimetype='application/json')
+    resp.headers['ETag'] = etag
+    return resp
 
 @app.route('/update_device', methods=['POST'])
 def update_device():
@@ -1543,9 +2233,10 @@ def update_device():
         device['monitored'] = data.get('monitored', False)
         device['device_type'] = data.get('device_type', 'employee')
         
-        monitor.save_data()
+        monitor._devices_rev += 1
+        monitor.save_data(alerts=False)
         return jsonify({'status': 'updated'})
-    
+
     return jsonify({'error': 'Device not found'}), 404
 
 @app.route('/update_calibration', methods=['POST'])
@@ -1554,6 +2245,8 @@ def update_calibration():
     monitor.calibration['referenceRSSI'] = data.get('referenceRSSI', -40)
     monitor.calibration['pathLossExponent'] = data.get('pathLossExponent', 2.0)
     monitor.calibration['distanceThreshold'] = data.get('distanceThreshold', 50)
+    monitor.calibration['scanConcurrency'] = int(data.get('scanConcurrency') or 128)
+    monitor._recalibrate()
     monitor.save_data()
     return jsonify({'status': 'updated'})
 
@@ -1569,120 +2262,251 @@ def stop_monitoring():
 
 @app.route('/clear_alerts', methods=['POST'])
 def clear_alerts():
-    monitor.alerts = []
-    monitor.save_data()
+    monitor.alerts.clear()
+    monitor._alerts_rev += 1
+    monitor.save_data(devices=False)
     return jsonify({'status': 'cleared'})
 
 @app.route('/export_attendance')
 def export_attendance():
     """Export attendance for a specific date"""
     date = request.args.get('date', datetime.now().strftime('%Y-%m-%d'))
-    
-    # Create temporary CSV
-    import csv
-    import tempfile
-    
-    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv', newline='') as f:
-        writer = csv.writer(f)
+
+    # Stream rows straight to the client - no tempfile round-trip
+    def generate():
+        out = io.StringIO()
+        writer = csv.writer(out)
         writer.writerow(['Time', 'Action', 'Name', 'Device Type', 'IP', 'MAC', 'Distance', 'Message'])
-        
-        for alert in monitor.alerts:
-            alert_date = datetime.fromisoformat(alert['timestamp']).strftime('%Y-%m-%d')
-            if alert_date == date:
-                device = monitor.devices.get(alert['ip'], {})
-                distance = device.get('estimated_distance', '')
-                
-                writer.writerow([
-                    datetime.fromisoformat(alert['timestamp']).strftime('%H:%M:%S'),
-                    alert['type'].upper(),
-                    alert['device_name'],
-                    alert.get('device_type', 'unknown'),
-                    alert['ip'],
-                    alert.get('mac', ''),
-                    f"{distance}m" if distance else '',
-                    alert.get('message', '')
-                ])
-        
-        temp_path = f.name
-    
-    return send_file(temp_path, as_attachment=True, 
-                    download_name=f'attendance_{date}.csv',
-                    mimetype='text/csv')
+        yield out.getvalue()
+        out.seek(0)
+        out.truncate(0)
 
-def find_available_port():
-    """Find an available port"""
-    for port in [8000, 8080, 3000, 8888, 5000]:
+        for alert in list(monitor.alerts):
+            stamp = datetime.fromisoformat(alert['timestamp'])
+            if stamp.strftime('%Y-%m-%d') != date:
+                continue
+            device = monitor.devices.get(alert['ip'], {})
+            distance = device.get('estimated_distance', '')
+
+            writer.writerow([
+                stamp.strftime('%H:%M:%S'),
+                alert['type'].upper(),
+                alert['device_name'],
+                alert.get('device_type', 'unknown'),
+                alert['ip'],
+                alert.get('mac', ''),
+                f"{distance}m" if distance else '',
+                alert.get('message', '')
+            ])
+            yield out.getvalue()
+            out.seek(0)
+            out.truncate(0)
+
+    return Response(
+        stream_with_context(generate()), mimetype='text/csv',
+        headers={'Content-Disposition':
+                 f'attachment; filename=attendance_{date}.csv'})
+
+_NET_CACHE_FILE = Path.home() / '.cache' / 'cnm' / 'net.json'
+
+def _gateway_mac():
+    """Best-effort MAC of the default gateway, for keying the net cache"""
+    if not _IS_LINUX:
+        # No cheap gateway lookup off-Linux - caller skips the cache
+        return None
+    try:
+        gw = None
+        with open('/proc/net/route') as f:
+            for line in f.readlines()[1:]:
+                fields = line.split()
+                if fields[1] == '00000000':  # default route
+                    gw = socket.inet_ntoa(struct.pack('<L', int(fields[2], 16)))
+                    break
+        if gw:
+            with open('/proc/net/arp') as f:
+                for line in f.readlines()[1:]:
+                    fields = line.split()
+                    if fields[0] == gw:
+                        return fields[3].upper()
+    except (OSError, IndexError, ValueError):
+        pass
+    return None
+
+def cached_local_network(monitor):
+    """get_local_network() with a file cache keyed by the gateway MAC.
+
+    Same gateway MAC means same network, so the UDP-connect detection
+    can be skipped entirely on restarts. When the gateway can't be
+    identified the cache is bypassed rather than trusted blindly.
+    """
+    gw_mac = _gateway_mac()
+    if gw_mac:
         try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            cached = json.loads(_NET_CACHE_FILE.read_text())
+            if cached.get('gateway_mac') == gw_mac:
+                return cached['base'], cached['local_ip']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    base, local_ip = monitor.get_local_network()
+
+    if gw_mac:
+        try:
+            _NET_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp = _NET_CACHE_FILE.with_suffix('.tmp')
+            tmp.write_text(json.dumps({'gateway_mac': gw_mac,
+                                       'base': base,
+                                       'local_ip': local_ip}))
+            os.replace(tmp, _NET_CACHE_FILE)
+        except OSError:
+            pass
+    return base, local_ip
+
+def _try_bind(port):
+    """Bind test for one candidate port - returns the port or None"""
+    try:
+        # SO_REUSEADDR so the probe's TIME_WAIT can't break the
+        # real bind that follows; 'with' guarantees the close
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             s.bind(('', port))
-            s.close()
             return port
-        except:
-            continue
-    return None
+    except OSError:
+        return None
+
+def find_available_port():
+    """Find an available port, probing all candidates at once"""
+    candidates = [8000, 8080, 3000, 8888, 5000]
+    # map() keeps candidate order, so preference still wins even
+    # though the bind syscalls overlap across threads
+    with ThreadPoolExecutor(max_workers=len(candidates)) as pool:
+        port = next(filter(None, pool.map(_try_bind, candidates)), None)
+    if port:
+        return port
+
+    # All preferred ports taken - let the kernel pick a free one
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.bind(('', 0))
+            return s.getsockname()[1]
+    except OSError:
+        return None
+
+# Whatever is currently serving (or a sentinel for servers that keep no
+# handle). Lets re-entrant main() calls - notebooks, embedding, test
+# reruns - short-circuit instead of rebinding ports and stacking servers
+_SERVER = None
+atexit.register(lambda: hasattr(_SERVER, 'shutdown') and _SERVER.shutdown())
+
+def _write_banner(data):
+    """One write() syscall straight to fd 1, skipping Python's stdout
+    buffering and its locks; fall back when stdout is redirected to
+    something that isn't fd 1 (closed, captured, odd consoles)"""
+    try:
+        os.write(1, data)
+    except OSError:
+        sys.stdout.buffer.write(data)
+        sys.stdout.flush()
 
 def main():
-    print("\n" + "="*60)
-    print(f"Complete Network Monitor ({platform.system()})")
-    print("="*60)
-    print("Features: Attendance Tracking + Distance Estimation")
-    
-    # Platform-specific notes
-    if platform.system() == 'Linux':
-        print("\n📝 Linux Notes:")
-        print("- May need sudo for MAC address detection")
-        print("- Install 'beep' for sound alerts: sudo apt-get install beep")
-        print("- Ensure 'arp' or 'ip' commands are available")
-    elif platform.system() == 'Darwin':
-        print("\n📝 macOS Notes:")
-        print("- Uses system sounds for alerts")
-        print("- May need to allow network access in System Preferences")
-    elif platform.system() == 'Windows':
-        print("\n📝 Windows Notes:")
-        print("- Run as Administrator for best results")
-        print("- Windows Defender may prompt for network access")
-    
-    print("\n📡 Distance Estimation:")
-    print("- Based on WiFi signal strength (RSSI)")
-    print("- Accuracy: ±5-20m depending on environment")
-    print("- Calibrate for your specific location")
-    
-    print("\n🎯 Distance Zones:")
-    print("- On-site: 0-10m")
-    print("- Near-site: 10-30m")
-    print("- Leaving: 30-50m")
-    print("- Away: >50m")
-    
+    global _SERVER
+    if _SERVER is not None:
+        return
+
     # Find available port
     port = find_available_port()
-    
+
     if not port:
-        print("\n❌ No available ports!")
+        _write_banner(_BANNER_FOR_HOST + _BANNER_NO_PORT)
         return
+
+    base, local_ip = cached_local_network(monitor)
+
+    # One buffered write for the whole banner - the static text was
+    # encoded at import, only the port/address fields get spliced in
+    port_b = str(port).encode('ascii')
+    _write_banner(_BANNER_FOR_HOST + _BANNER_TAIL % (
+        port_b, port_b, local_ip.encode('ascii'), port_b,
+        base.encode('ascii')))
     
-    base, local_ip = monitor.get_local_network()
-    
-    print(f"\n✅ Starting on port {port}")
-    print(f"\n📡 Access at:")
-    print(f"   http://localhost:{port}")
-    print(f"   http://{local_ip}:{port}")
-    print(f"\n🌐 Monitoring network: {base}.0/24")
-    print("\n⚙️  Features:")
-    print("   - Attendance tracking (arrival/departure)")
-    print("   - Distance estimation (when enabled)")
-    print("   - Cross-platform support")
-    print("   - Sound alerts")
-    print("   - CSV export")
-    print("\nPress Ctrl+C to stop\n")
-    
+    # Bind the listening socket ourselves while the probed port is still
+    # known-free - closes the race between probe and serve, and leaves
+    # room for SO_REUSEPORT multi-worker setups later
+    lsock = None
+    try:
+        lsock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        lsock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, 'SO_REUSEPORT'):
+            try:
+                lsock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            except OSError:
+                pass
+        lsock.bind(('0.0.0.0', port))
+        lsock.listen(128)
+    except OSError:
+        if lsock is not None:
+            lsock.close()
+        lsock = None
+
+    # Start scanning only now that startup work is done, so no sweep
+    # competes with the banner/bind path; the thread is a daemon, so
+    # Ctrl+C never waits on a half-finished scan
+    monitor.start_monitoring()
+
     try:
-        app.run(host='0.0.0.0', port=port, debug=False)
+        if HAS_UVICORN:
+            kwargs = ({'fd': lsock.fileno()} if lsock is not None
+                      else {'host': '0.0.0.0', 'port': port})
+            _SERVER = app  # uvicorn.run keeps no handle to return
+            uvicorn.run(WsgiToAsgi(app),
+                        loop='uvloop' if HAS_UVLOOP else 'auto',
+                        log_level='warning', access_log=False, **kwargs)
+        elif HAS_WAITRESS:
+            _SERVER = app  # ditto for waitress.serve
+            if lsock is not None:
+                waitress_serve(app, sockets=[lsock], threads=8)
+            else:
+                waitress_serve(app, host='0.0.0.0', port=port, threads=8)
+        else:
+            # Skip app.run()'s run_simple wrapper (reloader detection,
+            # banner, signal plumbing) and serve the WSGI app directly
+            from werkzeug.serving import make_server
+            srv = make_server(
+                '0.0.0.0', port, app, threaded=True,
+                fd=lsock.fileno() if lsock is not None else None)
+            _SERVER = srv
+
+            # Explicit SIGINT handling: trip a stop event and wind the
+            # accept loop down via shutdown() instead of waiting for
+            # the interpreter to surface KeyboardInterrupt mid-select.
+            # shutdown() blocks until the loop exits, so it runs on a
+            # helper thread rather than inside the handler
+            stop = threading.Event()
+
+            def _on_sigint(signum, frame):
+                stop.set()
+                threading.Thread(target=srv.shutdown, daemon=True).start()
+
+            try:
+                signal.signal(signal.SIGINT, _on_sigint)
+            except ValueError:
+                pass  # only installable from the main thread
+
+            srv.serve_forever()
+            if stop.is_set():
+                # Funnel into the same cleanup as a plain Ctrl+C
+                raise KeyboardInterrupt
     except KeyboardInterrupt:
-        print("\n\nStopped")
+        monitor.stop_monitoring()  # also flushes the JSON stores
+        _write_banner(_MSG_STOPPED)
+    except PermissionError as e:
+        # Type check, not a substring scan - strerror is localized
+        msg = _MSG_ERROR % str(e).encode('utf-8', 'replace')
+        if _IS_LINUX:
+            msg += _MSG_SUDO_HINT
+        _write_banner(msg)
     except Exception as e:
-        print(f"\n❌ Error: {e}")
-        if platform.system() == 'Linux' and 'Permission' in str(e):
-            print("Try running with sudo: sudo python3 script.py")
+        _write_banner(_MSG_ERROR % str(e).encode('utf-8', 'replace'))
 
 if __name__ == "__main__":
     if not HAS_FLASK: